@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
 from sklearn.cluster import KMeans
-from collections import Counter
 from typing import Optional, Tuple
 
 
@@ -14,7 +13,10 @@ def find_underperforming_bsks(
     Three Level Benchmark Approach for underperforming BSKs with recommendations.
     Args:
         bsks_df: DataFrame of BSKs
-        provisions_df: DataFrame of provisions (transactions)
+        provisions_df: DataFrame of provisions (transactions), or pre-aggregated
+            (bsk_id, service_id, provision_count) rows; the latter have no prov_date
+            and cannot be combined with period_start/period_end. Ties between equally
+            provided services go to the one whose row comes first
         deos_df: DataFrame of DEOs
         services_df: DataFrame of services
         period_start, period_end: filter provisions to this period (inclusive)
@@ -23,6 +25,11 @@ def find_underperforming_bsks(
     Returns:
         DataFrame with BSK info, total_services, recommended_services, and DEO details
     """
+    if (period_start or period_end) and 'prov_date' not in provisions_df.columns:
+        raise ValueError(
+            "period_start/period_end need per-transaction provisions with a prov_date column; "
+            "pre-aggregated provision counts cannot be filtered by period"
+        )
     # --- Ensure provisions_df has district_id for district-level logic ---
     provisions_df = provisions_df.merge(
         bsks_df[['bsk_id', 'district_id']],
@@ -37,9 +44,12 @@ def find_underperforming_bsks(
             provisions_df = provisions_df[provisions_df['prov_date'] >= pd.to_datetime(period_start)]
         if period_end:
             provisions_df = provisions_df[provisions_df['prov_date'] <= pd.to_datetime(period_end)]
+    # Raw transactions count once each; pre-aggregated rows carry their own count
+    if 'provision_count' not in provisions_df.columns:
+        provisions_df = provisions_df.assign(provision_count=1)
 
     # 2. Compute total services per BSK
-    service_counts = provisions_df.groupby('bsk_id').size().reset_index(name='total_services')
+    service_counts = provisions_df.groupby('bsk_id')['provision_count'].sum().reset_index(name='total_services')
     bsks_df = bsks_df.copy()
     bsks_df['bsk_id'] = pd.to_numeric(bsks_df['bsk_id'], errors='coerce')
     merged = bsks_df.merge(service_counts, on='bsk_id', how='left')
@@ -100,8 +110,10 @@ def find_underperforming_bsks(
         # Services delivered by this BSK
         bsk_services = set(provisions_df[provisions_df['bsk_id'] == bsk_id]['service_id'])
         # Top services in district
-        district_services = provisions_df[provisions_df['district_id'] == district_id]['service_id']
-        top_services = [sid for sid, _ in Counter(district_services).most_common(10)]
+        district_services = provisions_df[provisions_df['district_id'] == district_id]
+        # sort=False + keep='first' break ties by first appearance, as Counter.most_common did
+        district_counts = district_services.groupby('service_id', sort=False)['provision_count'].sum()
+        top_services = district_counts.nlargest(10, keep='first').index.tolist()
         # Recommend those not already delivered
         recommended = [sid for sid in top_services if sid not in bsk_services]
         # Get service names
@@ -4,6 +4,7 @@ This module provides functions to fetch data from the database tables.
 """
 
 import pandas as pd
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict
 import sys
@@ -40,6 +41,30 @@ def get_database_session() -> Optional[Session]:
         print(f"Error creating database session: {e}")
         return None
 
+def select_frame(db: Session, columns: List, blank_columns: List[str], *criteria, limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Run a column-projected SELECT and build a DataFrame from the row tuples.
+    
+    Args:
+        db: Database session
+        columns: Model columns to select, in output order
+        blank_columns: Output columns whose NULLs become ''
+        *criteria: Optional WHERE clauses
+        limit: Maximum number of rows (None for all)
+        
+    Returns:
+        DataFrame with one column per selected column
+    """
+    stmt = select(*columns)
+    if criteria:
+        stmt = stmt.where(*criteria)
+    if limit:
+        stmt = stmt.limit(limit)
+    
+    df = pd.DataFrame(db.execute(stmt).all(), columns=[column.key for column in columns])
+    df[blank_columns] = df[blank_columns].fillna('')
+    return df
+
 def fetch_services_from_db(include_inactive: bool = False) -> Optional[pd.DataFrame]:
     """
     Fetch services data from ServiceMaster table.
@@ -59,36 +84,22 @@ def fetch_services_from_db(include_inactive: bool = False) -> Optional[pd.DataFr
         return None
     
     try:
-        # Build query
-        query = db.query(ServiceMaster)
-        if not include_inactive:
-            query = query.filter(ServiceMaster.is_active == 1)
+        criteria = [] if include_inactive else [ServiceMaster.is_active == 1]
+        services_df = select_frame(db, [
+            ServiceMaster.service_id, ServiceMaster.service_name, ServiceMaster.service_type,
+            ServiceMaster.service_desc, ServiceMaster.common_name, ServiceMaster.department_name,
+            ServiceMaster.department_id, ServiceMaster.how_to_apply, ServiceMaster.eligibility_criteria,
+            ServiceMaster.required_doc, ServiceMaster.is_active, ServiceMaster.is_paid_service
+        ], [
+            'service_name', 'service_type', 'service_desc', 'common_name', 'department_name',
+            'how_to_apply', 'eligibility_criteria', 'required_doc'
+        ], *criteria)
         
-        services = query.all()
-        
-        if not services:
+        if services_df.empty:
             print("No services found in database")
             return None
         
-        # Convert to DataFrame
-        services_data = []
-        for service in services:
-            services_data.append({
-                'service_id': service.service_id,
-                'service_name': service.service_name or '',
-                'service_type': service.service_type or '',
-                'service_desc': service.service_desc or '',
-                'common_name': service.common_name or '',
-                'department_name': service.department_name or '',
-                'department_id': service.department_id,
-                'how_to_apply': service.how_to_apply or '',
-                'eligibility_criteria': service.eligibility_criteria or '',
-                'required_doc': service.required_doc or '',
-                'is_active': service.is_active,
-                'is_paid_service': service.is_paid_service
-            })
-        
-        return pd.DataFrame(services_data)
+        return services_df
         
     except Exception as e:
         print(f"Error fetching services: {e}")
@@ -115,35 +126,20 @@ def fetch_bsks_from_db(include_inactive: bool = False) -> Optional[pd.DataFrame]
         return None
     
     try:
-        # Build query
-        query = db.query(BSKMaster)
-        if not include_inactive:
-            query = query.filter(BSKMaster.is_active == True)
+        criteria = [] if include_inactive else [BSKMaster.is_active == True]
+        bsks_df = select_frame(db, [
+            BSKMaster.bsk_id, BSKMaster.bsk_name, BSKMaster.bsk_code, BSKMaster.district_name,
+            BSKMaster.district_id, BSKMaster.block_municipalty_name, BSKMaster.bsk_lat,
+            BSKMaster.bsk_long, BSKMaster.bsk_address, BSKMaster.is_active, BSKMaster.no_of_deos
+        ], [
+            'bsk_name', 'bsk_code', 'district_name', 'block_municipalty_name', 'bsk_address'
+        ], *criteria)
         
-        bsks = query.all()
-        
-        if not bsks:
+        if bsks_df.empty:
             print("No BSKs found in database")
             return None
         
-        # Convert to DataFrame
-        bsk_data = []
-        for bsk in bsks:
-            bsk_data.append({
-                'bsk_id': bsk.bsk_id,
-                'bsk_name': bsk.bsk_name or '',
-                'bsk_code': bsk.bsk_code or '',
-                'district_name': bsk.district_name or '',
-                'district_id': bsk.district_id,
-                'block_municipalty_name': bsk.block_municipalty_name or '',
-                'bsk_lat': bsk.bsk_lat,
-                'bsk_long': bsk.bsk_long,
-                'bsk_address': bsk.bsk_address or '',
-                'is_active': bsk.is_active,
-                'no_of_deos': bsk.no_of_deos
-            })
-        
-        return pd.DataFrame(bsk_data)
+        return bsks_df
         
     except Exception as e:
         print(f"Error fetching BSKs: {e}")
@@ -170,34 +166,21 @@ def fetch_deos_from_db(include_inactive: bool = False) -> Optional[pd.DataFrame]
         return None
     
     try:
-        # Build query
-        query = db.query(DEOMaster)
-        if not include_inactive:
-            query = query.filter(DEOMaster.is_active == True)
+        criteria = [] if include_inactive else [DEOMaster.is_active == True]
+        deos_df = select_frame(db, [
+            DEOMaster.agent_id, DEOMaster.user_name, DEOMaster.agent_code, DEOMaster.agent_email,
+            DEOMaster.agent_phone, DEOMaster.bsk_id, DEOMaster.bsk_name,
+            DEOMaster.date_of_engagement, DEOMaster.bsk_post, DEOMaster.is_active
+        ], [
+            'user_name', 'agent_code', 'agent_email', 'agent_phone', 'bsk_name',
+            'date_of_engagement', 'bsk_post'
+        ], *criteria)
         
-        deos = query.all()
-        
-        if not deos:
+        if deos_df.empty:
             print("No DEOs found in database")
             return None
         
-        # Convert to DataFrame
-        deo_data = []
-        for deo in deos:
-            deo_data.append({
-                'agent_id': deo.agent_id,
-                'user_name': deo.user_name or '',
-                'agent_code': deo.agent_code or '',
-                'agent_email': deo.agent_email or '',
-                'agent_phone': deo.agent_phone or '',
-                'bsk_id': deo.bsk_id,
-                'bsk_name': deo.bsk_name or '',
-                'date_of_engagement': deo.date_of_engagement or '',
-                'bsk_post': deo.bsk_post or '',
-                'is_active': deo.is_active
-            })
-        
-        return pd.DataFrame(deo_data)
+        return deos_df
         
     except Exception as e:
         print(f"Error fetching DEOs: {e}")
@@ -224,32 +207,19 @@ def fetch_provisions_from_db(limit: Optional[int] = None) -> Optional[pd.DataFra
         return None
     
     try:
-        query = db.query(Provision)
-        if limit:
-            query = query.limit(limit)
+        provisions_df = select_frame(db, [
+            Provision.bsk_id, Provision.bsk_name, Provision.customer_id, Provision.customer_name,
+            Provision.customer_phone, Provision.service_id, Provision.service_name,
+            Provision.prov_date, Provision.docket_no
+        ], [
+            'bsk_name', 'customer_name', 'customer_phone', 'service_name', 'prov_date', 'docket_no'
+        ], limit=limit)
         
-        provisions = query.all()
-        
-        if not provisions:
+        if provisions_df.empty:
             print("No provisions found in database")
             return None
         
-        # Convert to DataFrame
-        provision_data = []
-        for provision in provisions:
-            provision_data.append({
-                'bsk_id': provision.bsk_id,
-                'bsk_name': provision.bsk_name or '',
-                'customer_id': provision.customer_id,
-                'customer_name': provision.customer_name or '',
-                'customer_phone': provision.customer_phone or '',
-                'service_id': provision.service_id,
-                'service_name': provision.service_name or '',
-                'prov_date': provision.prov_date or '',
-                'docket_no': provision.docket_no or ''
-            })
-        
-        return pd.DataFrame(provision_data)
+        return provisions_df
         
     except Exception as e:
         print(f"Error fetching provisions: {e}")
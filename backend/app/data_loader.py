@@ -1,5 +1,10 @@
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+from pyarrow import parquet as pq
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import logging
 
@@ -7,29 +12,183 @@ logger = logging.getLogger(__name__)
 
 # Simple path resolution
 def get_data_dir():
-    """Get data directory path"""
-    # Try multiple possible locations
-    possible_paths = [
-        Path(__file__).parent.parent.parent / "data",  # From backend/app/
-        Path("/opt/render/project/src/data"),          # Render absolute path
-        Path("data"),                                   # Relative from run location
-        Path("../../data"),                            # Two levels up
-    ]
-    
-    for path in possible_paths:
-        if path.exists():
-            logger.info(f"Found data directory at: {path}")
-            return path
-    
-    # Default to first option
-    logger.warning(f"Data directory not found, using default: {possible_paths[0]}")
-    return possible_paths[0]
+    """Get data directory path: $BSK_DATA_DIR if set, else <repo>/data"""
+    env_dir = os.environ.get("BSK_DATA_DIR")
+    path = Path(env_dir) if env_dir else Path(__file__).parent.parent.parent / "data"
+    logger.debug("Using data directory %s", path)
+    return path
 
+# Resolved once at import, with no filesystem probes; forked workers inherit it
 DATA_DIR = get_data_dir()
 
+# Column types for each CSV - skips type inference and limits parsing
+# to the columns the API returns. Columns that may be blank stay as strings.
+SERVICES_DTYPES = {
+    "service_id": "int32",
+    "service_name": "string",
+    "common_name": "string",
+    "action_name": "string",
+    "service_link": "string",
+    "department_id": "string",
+    "department_name": "string",
+    "is_new": "int8",
+    "service_type": "string",
+    "is_active": "int8",
+    "is_paid_service": "string",
+    "service_desc": "string",
+    "how_to_apply": "string",
+    "eligibility_criteria": "string",
+    "required_doc": "string",
+}
+
+BSKS_DTYPES = {
+    "bsk_id": "int32",
+    "bsk_name": "string",
+    "district_name": "string",
+    "sub_division_name": "string",
+    "block_municipalty_name": "string",
+    "gp_ward": "string",
+    "gp_ward_distance": "string",
+    "bsk_type": "string",
+    "bsk_sub_type": "string",
+    "bsk_code": "string",
+    "no_of_deos": "int16",
+    "is_aadhar_center": "int8",
+    "bsk_address": "string",
+    "bsk_lat": "string",
+    "bsk_long": "string",
+    "bsk_account_no": "string",
+    "bsk_landline_no": "string",
+    "is_saturday_open": "string",
+    "is_active": "string",
+    "district_id": "int32",
+    "block_mun_id": "int32",
+    "gp_id": "int32",
+    "sub_div_id": "int32",
+    "pin": "string",
+}
+
+DEOS_DTYPES = {
+    "agent_id": "int32",
+    "user_id": "int32",
+    "grp": "string",
+    "user_name": "string",
+    "agent_code": "string",
+    "agent_email": "string",
+    "agent_phone": "string",
+    "date_of_engagement": "string",
+    "user_emp_no": "string",
+    "bsk_id": "int32",
+    "bsk_name": "string",
+    "bsk_code": "string",
+    "bsk_distid": "int32",
+    "bsk_subdivid": "int32",
+    "bsk_blockid": "int32",
+    "bsk_gpwdid": "int32",
+    "user_islocked": "string",
+    "is_active": "string",
+    "bsk_post": "string",
+}
+
+PROVISIONS_DTYPES = {
+    "bsk_id": "int32",
+    "bsk_name": "string",
+    "customer_id": "string",
+    "customer_name": "string",
+    "customer_phone": "string",
+    "service_id": "int32",
+    "service_name": "string",
+    "prov_date": "string",
+    "docket_no": "string",
+}
+
+# pandas dtype names used above -> Arrow types for pyarrow.csv
+ARROW_TYPES = {
+    "int8": pa.int8(),
+    "int16": pa.int16(),
+    "int32": pa.int32(),
+    "string": pa.string(),
+}
+
+# Cache key -> (filename, dtypes, encoding). provision.csv is cp1252; the
+# parquet cache stores it already decoded.
+CSV_TABLES = {
+    'services': ("service_master.csv", SERVICES_DTYPES, 'utf-8'),
+    'bsks': ("bsk_master.csv", BSKS_DTYPES, 'utf-8'),
+    'deos': ("deo_master.csv", DEOS_DTYPES, 'utf-8'),
+    'provisions': ("provision.csv", PROVISIONS_DTYPES, 'cp1252'),
+}
+
 # Cache for loaded data
 _data_cache = None
 
+def cache_is_current(csv_path, pq_path, dtypes):
+    """True if pq_path is newer than csv_path and holds exactly the expected columns and types"""
+    if not pq_path.exists() or pq_path.stat().st_mtime < csv_path.stat().st_mtime:
+        return False
+    try:
+        schema = pq.read_schema(pq_path)
+    except Exception as e:
+        logger.warning(f"Unreadable parquet cache {pq_path}, rebuilding: {e}")
+        return False
+    # Caches written by older versions (all columns, inferred dtypes) get rebuilt
+    expected = {col: ARROW_TYPES[dtype] for col, dtype in dtypes.items()}
+    return {field.name: field.type for field in schema} == expected
+
+def read_cached_csv(filename, dtypes, encoding='utf-8'):
+    """Read a CSV as an Arrow table via its sibling .parquet cache, rebuilding it when the CSV is newer"""
+    csv_path = DATA_DIR / filename
+    pq_path = csv_path.with_suffix(".parquet")
+    
+    if cache_is_current(csv_path, pq_path, dtypes):
+        return pq.read_table(pq_path)
+    
+    # Multithreaded Arrow parse; blank strings stay '' (strings_can_be_null is off)
+    # so no separate fillna pass is needed
+    table = pacsv.read_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(encoding=encoding),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: ARROW_TYPES[dtype] for col, dtype in dtypes.items()},
+            include_columns=list(dtypes)
+        )
+    )
+    try:
+        write_parquet_atomic(table, pq_path)
+    except Exception as e:
+        # Read-only or full disk: serve from the CSV and retry on next load
+        logger.warning(f"Could not write parquet cache {pq_path}: {e}")
+    return table
+
+def write_parquet_atomic(table, pq_path):
+    """Write table to a temp file beside pq_path and rename it into place, so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=pq_path.parent, prefix=f"{pq_path.stem}.", suffix=".parquet")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, pq_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def to_frame(table):
+    """Convert an Arrow table to pandas, one block per column so numeric columns aren't copied into a consolidated block"""
+    return table.to_pandas(split_blocks=True, types_mapper={pa.string(): pd.StringDtype()}.get)
+
+def categorize_strings(df, max_ratio=0.5):
+    """Convert repetitive string columns (unique/rows below max_ratio) to category dtype"""
+    if df.empty:
+        return df
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        if df[col].nunique() / len(df) < max_ratio:
+            df[col] = df[col].astype("category")
+    return df
+
+def index_by(df, key):
+    """Map each key value to the position of its first row; rows are built at lookup time"""
+    firsts = df[key].reset_index(drop=True).drop_duplicates()
+    return dict(zip(firsts.tolist(), firsts.index.tolist()))
+
 def load_csv_data(force_reload=False):
     """Load all CSV files into pandas DataFrames with caching"""
     global _data_cache
@@ -41,36 +200,41 @@ def load_csv_data(force_reload=False):
         logger.info(f"Loading CSV files from {DATA_DIR}")
         
         # Check if files exist
-        required_files = [
-            "service_master.csv",
-            "bsk_master.csv",
-            "deo_master.csv",
-            "provision.csv"
-        ]
-        
-        for filename in required_files:
+        for filename, _, _ in CSV_TABLES.values():
             filepath = DATA_DIR / filename
             if not filepath.exists():
                 logger.error(f"❌ Required file not found: {filepath}")
                 return None
         
-        # Load with proper encoding
-        services_df = pd.read_csv(DATA_DIR / "service_master.csv", encoding='utf-8')
-        bsks_df = pd.read_csv(DATA_DIR / "bsk_master.csv", encoding='utf-8')
-        deos_df = pd.read_csv(DATA_DIR / "deo_master.csv", encoding='utf-8')
-        provisions_df = pd.read_csv(DATA_DIR / "provision.csv", encoding='cp1252')
+        # Load the files concurrently - the pyarrow readers release the GIL
+        tables = {}
+        with ThreadPoolExecutor(max_workers=len(CSV_TABLES)) as executor:
+            futures = {
+                executor.submit(read_cached_csv, filename, dtypes, encoding): name
+                for name, (filename, dtypes, encoding) in CSV_TABLES.items()
+            }
+            for future in as_completed(futures):
+                tables[futures[future]] = future.result()
         
-        # Clean data - fill NaN values
-        services_df = services_df.fillna('')
-        bsks_df = bsks_df.fillna('')
-        deos_df = deos_df.fillna('')
-        provisions_df = provisions_df.fillna('')
+        # Low-cardinality strings (district, status, service type...) become
+        # categories: small integer codes instead of one object per cell
+        frames = {name: categorize_strings(to_frame(table)) for name, table in tables.items()}
+        
+        services_df = frames['services']
+        bsks_df = frames['bsks']
+        deos_df = frames['deos']
+        provisions_df = frames['provisions']
         
         _data_cache = {
             'services': services_df,
             'bsks': bsks_df,
             'deos': deos_df,
-            'provisions': provisions_df
+            'provisions': provisions_df,
+            # Primary-key -> row position maps so point lookups are dict probes, not column scans
+            'services_by_id': index_by(services_df, 'service_id'),
+            'bsks_by_code': index_by(bsks_df, 'bsk_code'),
+            'deos_by_id': index_by(deos_df, 'agent_id'),
+            'provisions_by_customer': index_by(provisions_df, 'customer_id')
         }
         
         logger.info(f"✅ Loaded {len(services_df)} services, {len(bsks_df)} BSKs, "
@@ -84,4 +248,45 @@ def load_csv_data(force_reload=False):
         traceback.print_exc()
         return None
 
-# ... (rest of the functions stay the same)
\ No newline at end of file
+def _get_records(name, skip=0, limit=None):
+    """Return a page of rows from a cached DataFrame as a list of dicts"""
+    data = load_csv_data()
+    if data is None:
+        return []
+    df = data[name]
+    end = None if limit is None else skip + limit
+    return df.iloc[skip:end].to_dict(orient='records')
+
+def _get_by_key(name, index, key):
+    """Return the row of a cached DataFrame found via its primary-key position map, or None"""
+    data = load_csv_data()
+    if data is None:
+        return None
+    pos = data[index].get(key)
+    if pos is None:
+        return None
+    return data[name].iloc[[pos]].to_dict(orient='records')[0]
+
+def get_services(skip=0, limit=None):
+    return _get_records('services', skip, limit)
+
+def get_service_by_id(sid):
+    return _get_by_key('services', 'services_by_id', sid)
+
+def get_bsks(skip=0, limit=None):
+    return _get_records('bsks', skip, limit)
+
+def get_bsk_by_code(code):
+    return _get_by_key('bsks', 'bsks_by_code', code)
+
+def get_deos(skip=0, limit=None):
+    return _get_records('deos', skip, limit)
+
+def get_deo_by_id(aid):
+    return _get_by_key('deos', 'deos_by_id', aid)
+
+def get_provisions(skip=0, limit=None):
+    return _get_records('provisions', skip, limit)
+
+def get_provision_by_customer(cid):
+    return _get_by_key('provisions', 'provisions_by_customer', cid)
@@ -1,16 +1,21 @@
 from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models import models
 from app.models.schemas import (
     BSKMaster, ServiceMaster, DEOMaster, Provision
 )
 from app.models.database import engine, get_db
-from typing import List
+from collections import OrderedDict
+import asyncio
+import threading
+import time
 import os
 from dotenv import load_dotenv
 import logging
-import pandas as pd
+import orjson
 import sys
 import gc
 
@@ -44,6 +49,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# In-process LRU for point lookups: (kind, key) -> (expires_at, schema object).
+# Entries expire after LOOKUP_CACHE_TTL seconds; write endpoints must clear it.
+LOOKUP_CACHE_SIZE = 4096
+LOOKUP_CACHE_TTL = 60
+_lookup_cache = OrderedDict()
+_lookup_cache_lock = threading.Lock()
+
+def cached_lookup(kind, key, fetch):
+    """Return the cached schema object for (kind, key), calling fetch() on a miss"""
+    cache_key = (kind, key)
+    now = time.monotonic()
+    with _lookup_cache_lock:
+        entry = _lookup_cache.get(cache_key)
+        if entry is not None and entry[0] > now:
+            _lookup_cache.move_to_end(cache_key)
+            return entry[1]
+    
+    value = fetch()
+    if value is not None:
+        with _lookup_cache_lock:
+            _lookup_cache[cache_key] = (now + LOOKUP_CACHE_TTL, value)
+            _lookup_cache.move_to_end(cache_key)
+            while len(_lookup_cache) > LOOKUP_CACHE_SIZE:
+                _lookup_cache.popitem(last=False)
+    return value
+
+# List endpoints are paginated: `limit` defaults to LIST_LIMIT_DEFAULT rows and
+# is capped at LIST_LIMIT_MAX. Clients needing a full table page with skip, or
+# use /bsk/export for the whole BSK table as CSV.
+LIST_LIMIT_DEFAULT = 100
+LIST_LIMIT_MAX = 1000
+EXPORT_CHUNK_SIZE = 5_000
+
+# /underperforming_bsks/ serves a result computed at startup and refreshed on
+# this interval, since the underlying tables change only on data refreshes
+UNDERPERFORMING_REFRESH_SECONDS = int(os.getenv("UNDERPERFORMING_REFRESH_SECONDS", 15 * 60))
+app.state.underperforming = None
+app.state.underperforming_task = None
+# Serializes the on-demand fallback so concurrent requests compute it only once
+_underperforming_lock = threading.Lock()
+
+def list_rows(db, model, skip=0, limit=LIST_LIMIT_DEFAULT):
+    """Fetch a page of a table as plain dicts, without ORM instances or schema validation"""
+    # Ordered by the primary key, then every other column: Provision's customer_id
+    # repeats, so the key alone doesn't give consecutive skip/limit pages a total order
+    table = model.__table__
+    query = (
+        db.query(*table.columns)
+        .order_by(*table.primary_key.columns, *(c for c in table.columns if not c.primary_key))
+        .offset(skip)
+        .limit(limit)
+    )
+    return [row._asdict() for row in query.all()]
+
+def orjson_response(content):
+    """JSON response encoded with orjson directly, skipping jsonable_encoder and response_model validation"""
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        media_type="application/json"
+    )
+
+def count_rows(db, column):
+    """COUNT(column) over a table, for list endpoints called with count_only"""
+    return {"count": db.query(func.count(column)).scalar()}
+
+def export_csv(model):
+    """Stream a whole table as CSV, reading and encoding EXPORT_CHUNK_SIZE rows at a time"""
+    import pandas as pd
+    
+    def iter_csv():
+        # stream_results asks the driver for a server-side cursor; without it psycopg2
+        # fetches the whole result set before pandas yields the first chunk
+        with engine.connect().execution_options(stream_results=True) as conn:
+            header = True
+            for chunk in pd.read_sql_query(select(model.__table__), conn, chunksize=EXPORT_CHUNK_SIZE):
+                yield chunk.to_csv(index=False, header=header)
+                header = False
+    return StreamingResponse(
+        iter_csv(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={model.__tablename__}.csv"}
+    )
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup"""
@@ -77,11 +165,31 @@ async def startup_event():
         logger.warning("⚠️  Continuing without pre-computed embeddings")
         logger.warning("Recommendations will compute embeddings on-demand (slower)")
     
+    # Precompute the underperforming-BSK analytic and keep it fresh in the background
+    try:
+        app.state.underperforming = await asyncio.to_thread(compute_underperforming_bsks)
+        logger.info(f"✅ Precomputed {len(app.state.underperforming)} underperforming BSK scores")
+    except Exception as e:
+        logger.error(f"❌ Failed to precompute underperforming BSKs: {e}")
+        logger.warning("⚠️  /underperforming_bsks/ will compute on first request")
+    app.state.underperforming_task = asyncio.create_task(refresh_underperforming_bsks())
+    
     logger.info("✅ Application startup complete")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background refresh of the underperforming-BSK result"""
+    task = app.state.underperforming_task
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
 @app.get("/")
 def read_root():
-    logger.info("Root endpoint accessed")
+    logger.debug("Root endpoint accessed")
     return {
         "message": "Welcome to BSK Training Optimization API",
         "status": "online",
@@ -92,9 +200,8 @@ def read_root():
 @app.get("/health")
 def health_check():
     """Health check endpoint for Render"""
-    from ai_service.service_recommendation import get_embedding_stats
-    
     try:
+        from ai_service.service_recommendation import get_embedding_stats
         stats = get_embedding_stats()
         return {
             "status": "healthy",
@@ -109,121 +216,181 @@ def health_check():
             "embeddings_loaded": False
         }
 
+@app.get("/overview")
+def get_overview(db: Session = Depends(get_db)):
+    """Row counts for the dashboard summary, in one round trip"""
+    return {
+        "bsks": db.query(func.count(models.BSKMaster.bsk_id)).scalar(),
+        "deos": db.query(func.count(models.DEOMaster.agent_id)).scalar(),
+        "services": db.query(func.count(models.ServiceMaster.service_id)).scalar()
+    }
+
 # BSK Master endpoints
-@app.get("/bsk/", response_model=List[BSKMaster])
-def get_bsk_list(skip: int = 0, limit: int = Query(None), db: Session = Depends(get_db)):
-    logger.info(f"Fetching BSK list with skip={skip}, limit={limit}")
-    query = db.query(models.BSKMaster).offset(skip)
-    if limit is not None:
-        query = query.limit(limit)
-    bsk_list = query.all()
-    logger.info(f"Found {len(bsk_list)} BSK records")
-    return bsk_list
+@app.get("/bsk/")
+def get_bsk_list(skip: int = 0, limit: int = Query(LIST_LIMIT_DEFAULT, ge=1, le=LIST_LIMIT_MAX), count_only: bool = False, db: Session = Depends(get_db)):
+    logger.debug("Fetching BSK list with skip=%s, limit=%s", skip, limit)
+    if count_only:
+        return count_rows(db, models.BSKMaster.bsk_id)
+    bsk_list = list_rows(db, models.BSKMaster, skip, limit)
+    logger.debug("Found %s BSK records", len(bsk_list))
+    return orjson_response(bsk_list)
+
+@app.get("/bsk/export")
+def export_bsk_list():
+    """Full BSK table as a streamed CSV download"""
+    return export_csv(models.BSKMaster)
 
 @app.get("/bsk/{bsk_code}", response_model=BSKMaster)
 def get_bsk(bsk_code: str, db: Session = Depends(get_db)):
-    logger.info(f"Fetching BSK with code: {bsk_code}")
-    bsk = db.query(models.BSKMaster).filter(models.BSKMaster.bsk_code == bsk_code).first()
+    logger.debug("Fetching BSK with code: %s", bsk_code)
+    def fetch():
+        bsk = db.query(models.BSKMaster).filter(models.BSKMaster.bsk_code == bsk_code).first()
+        return BSKMaster.model_validate(bsk) if bsk is not None else None
+    bsk = cached_lookup("bsk", bsk_code, fetch)
     if bsk is None:
-        logger.warning(f"BSK not found with code: {bsk_code}")
+        logger.warning("BSK not found with code: %s", bsk_code)
         raise HTTPException(status_code=404, detail="BSK not found")
     return bsk
 
 # Service Master endpoints
-@app.get("/services/", response_model=List[ServiceMaster])
-def get_services(skip: int = 0, limit: int = Query(None), db: Session = Depends(get_db)):
-    logger.info(f"Fetching services with skip={skip}, limit={limit}")
-    query = db.query(models.ServiceMaster).offset(skip)
-    if limit is not None:
-        query = query.limit(limit)
-    services = query.all()
-    logger.info(f"Found {len(services)} service records")
-    return services
+@app.get("/services/")
+def get_services(skip: int = 0, limit: int = Query(LIST_LIMIT_DEFAULT, ge=1, le=LIST_LIMIT_MAX), count_only: bool = False, db: Session = Depends(get_db)):
+    logger.debug("Fetching services with skip=%s, limit=%s", skip, limit)
+    if count_only:
+        return count_rows(db, models.ServiceMaster.service_id)
+    services = list_rows(db, models.ServiceMaster, skip, limit)
+    logger.debug("Found %s service records", len(services))
+    return orjson_response(services)
 
 @app.get("/services/{service_id}", response_model=ServiceMaster)
 def get_service(service_id: int, db: Session = Depends(get_db)):
-    logger.info(f"Fetching service with ID: {service_id}")
-    service = db.query(models.ServiceMaster).filter(models.ServiceMaster.service_id == service_id).first()
+    logger.debug("Fetching service with ID: %s", service_id)
+    def fetch():
+        service = db.query(models.ServiceMaster).filter(models.ServiceMaster.service_id == service_id).first()
+        return ServiceMaster.model_validate(service) if service is not None else None
+    service = cached_lookup("service", service_id, fetch)
     if service is None:
-        logger.warning(f"Service not found with ID: {service_id}")
+        logger.warning("Service not found with ID: %s", service_id)
         raise HTTPException(status_code=404, detail="Service not found")
     return service
 
 # DEO Master endpoints
-@app.get("/deo/", response_model=List[DEOMaster])
-def get_deo_list(skip: int = 0, limit: int = Query(None), db: Session = Depends(get_db)):
-    logger.info(f"Fetching DEO list with skip={skip}, limit={limit}")
-    query = db.query(models.DEOMaster).offset(skip)
-    if limit is not None:
-        query = query.limit(limit)
-    deo_list = query.all()
-    logger.info(f"Found {len(deo_list)} DEO records")
-    return deo_list
+@app.get("/deo/")
+def get_deo_list(skip: int = 0, limit: int = Query(LIST_LIMIT_DEFAULT, ge=1, le=LIST_LIMIT_MAX), count_only: bool = False, db: Session = Depends(get_db)):
+    logger.debug("Fetching DEO list with skip=%s, limit=%s", skip, limit)
+    if count_only:
+        return count_rows(db, models.DEOMaster.agent_id)
+    deo_list = list_rows(db, models.DEOMaster, skip, limit)
+    logger.debug("Found %s DEO records", len(deo_list))
+    return orjson_response(deo_list)
 
 @app.get("/deo/{agent_id}", response_model=DEOMaster)
 def get_deo(agent_id: int, db: Session = Depends(get_db)):
-    logger.info(f"Fetching DEO with agent ID: {agent_id}")
-    deo = db.query(models.DEOMaster).filter(models.DEOMaster.agent_id == agent_id).first()
+    logger.debug("Fetching DEO with agent ID: %s", agent_id)
+    def fetch():
+        deo = db.query(models.DEOMaster).filter(models.DEOMaster.agent_id == agent_id).first()
+        return DEOMaster.model_validate(deo) if deo is not None else None
+    deo = cached_lookup("deo", agent_id, fetch)
     if deo is None:
-        logger.warning(f"DEO not found with agent ID: {agent_id}")
+        logger.warning("DEO not found with agent ID: %s", agent_id)
         raise HTTPException(status_code=404, detail="DEO not found")
     return deo
 
 # Provision endpoints
-@app.get("/provisions/", response_model=List[Provision])
-def get_provisions(skip: int = 0, limit: int = Query(None), db: Session = Depends(get_db)):
-    logger.info(f"Fetching provisions with skip={skip}, limit={limit}")
-    query = db.query(models.Provision).offset(skip)
-    if limit is not None:
-        query = query.limit(limit)
-    provisions = query.all()
-    logger.info(f"Found {len(provisions)} provision records")
-    return provisions
+@app.get("/provisions/")
+def get_provisions(skip: int = 0, limit: int = Query(LIST_LIMIT_DEFAULT, ge=1, le=LIST_LIMIT_MAX), count_only: bool = False, db: Session = Depends(get_db)):
+    logger.debug("Fetching provisions with skip=%s, limit=%s", skip, limit)
+    if count_only:
+        return count_rows(db, models.Provision.customer_id)
+    provisions = list_rows(db, models.Provision, skip, limit)
+    logger.debug("Found %s provision records", len(provisions))
+    return orjson_response(provisions)
 
 @app.get("/provisions/{customer_id}", response_model=Provision)
 def get_provision(customer_id: str, db: Session = Depends(get_db)):
-    logger.info(f"Fetching provision with customer_id: {customer_id}")
-    provision = db.query(models.Provision).filter(models.Provision.customer_id == customer_id).first()
+    logger.debug("Fetching provision with customer_id: %s", customer_id)
+    def fetch():
+        provision = db.query(models.Provision).filter(models.Provision.customer_id == customer_id).first()
+        return Provision.model_validate(provision) if provision is not None else None
+    provision = cached_lookup("provision", customer_id, fetch)
     if provision is None:
-        logger.warning(f"Provision not found with customer_id: {customer_id}")
+        logger.warning("Provision not found with customer_id: %s", customer_id)
         raise HTTPException(status_code=404, detail="Provision not found")
     return provision
 
+def compute_underperforming_bsks():
+    """Run the underperforming-BSK analytic over the current tables, sorted by ascending score"""
+    # Deferred so importing the app doesn't pull in pandas and the analytics stack
+    import pandas as pd
+    from ai_service.bsk_analytics import find_underperforming_bsks
+    
+    # Column-projected SELECTs of only what the analytic uses: no ORM objects and
+    # no per-call table reflection (read_sql_table reflects the schema every time)
+    bsks_df = pd.read_sql_query(select(
+        models.BSKMaster.bsk_id, models.BSKMaster.bsk_code, models.BSKMaster.bsk_name,
+        models.BSKMaster.district_id, models.BSKMaster.district_name,
+        models.BSKMaster.block_municipalty_name, models.BSKMaster.bsk_lat, models.BSKMaster.bsk_long
+    ), engine)
+    # Provisions are the large table: count per (bsk_id, service_id) in the database
+    # so only the pairs cross the wire. Every row is counted. The former
+    # db.query(Provision).all() went through the ORM identity map, which kept one
+    # row per customer_id (the declared primary key, which is not unique in the
+    # data) and dropped the rest.
+    provisions_df = pd.read_sql_query(
+        select(
+            models.Provision.bsk_id,
+            models.Provision.service_id,
+            func.count().label('provision_count')
+        )
+        .group_by(models.Provision.bsk_id, models.Provision.service_id)
+        .order_by(models.Provision.bsk_id, models.Provision.service_id),
+        engine
+    )
+    deos_df = pd.read_sql_query(select(
+        models.DEOMaster.bsk_id, models.DEOMaster.agent_id, models.DEOMaster.user_name,
+        models.DEOMaster.agent_code, models.DEOMaster.agent_email, models.DEOMaster.agent_phone,
+        models.DEOMaster.date_of_engagement, models.DEOMaster.bsk_post
+    ), engine)
+    services_df = pd.read_sql_query(select(
+        models.ServiceMaster.service_id, models.ServiceMaster.service_name
+    ), engine)
+    
+    result_df = find_underperforming_bsks(bsks_df, provisions_df, deos_df, services_df)
+    return result_df.sort_values(by="score").reset_index(drop=True)
+
+async def refresh_underperforming_bsks():
+    """Recompute app.state.underperforming every UNDERPERFORMING_REFRESH_SECONDS"""
+    while True:
+        await asyncio.sleep(UNDERPERFORMING_REFRESH_SECONDS)
+        try:
+            app.state.underperforming = await asyncio.to_thread(compute_underperforming_bsks)
+        except Exception as e:
+            logger.error(f"Failed to refresh underperforming BSKs: {e}")
+
 @app.get("/underperforming_bsks/")
 def get_underperforming_bsks(
     num_bsks: int = 50,
-    sort_order: str = 'asc',
-    db: Session = Depends(get_db)
+    sort_order: str = 'asc'
 ):
     try:
-        from ai_service.bsk_analytics import find_underperforming_bsks
-        
-        # Fetch all BSKs, provisions, DEOs, and services
-        bsks = db.query(models.BSKMaster).all()
-        provisions = db.query(models.Provision).all()
-        deos = db.query(models.DEOMaster).all()
-        services = db.query(models.ServiceMaster).all()
-        
-        # Convert to DataFrame
-        bsks_df = pd.DataFrame([b.__dict__ for b in bsks])
-        provisions_df = pd.DataFrame([p.__dict__ for p in provisions])
-        deos_df = pd.DataFrame([d.__dict__ for d in deos])
-        services_df = pd.DataFrame([s.__dict__ for s in services])
-        
-        # Remove SQLAlchemy _sa_instance_state
-        for df in [bsks_df, provisions_df, deos_df, services_df]:
-            if '_sa_instance_state' in df.columns:
-                df.drop('_sa_instance_state', axis=1, inplace=True)
-        
-        # Compute underperforming BSKs
-        result_df = find_underperforming_bsks(bsks_df, provisions_df, deos_df, services_df)
+        # Served from the result precomputed at startup and refreshed in the background
+        result_df = app.state.underperforming
+        if result_df is None:
+            with _underperforming_lock:
+                result_df = app.state.underperforming
+                if result_df is None:
+                    result_df = app.state.underperforming = compute_underperforming_bsks()
         
-        # Sort by score and return requested number
-        ascending = sort_order == 'asc'
-        result_df = result_df.sort_values(by="score", ascending=ascending).head(num_bsks)
+        if sort_order != 'asc':
+            result_df = result_df.iloc[::-1]
+        result_df = result_df.head(num_bsks)
         
-        # Return as JSON
-        return result_df.to_dict(orient='records')
+        # Stream as NDJSON so clients can start parsing before the last record is written
+        records = result_df.to_dict(orient='records')
+        def iter_ndjson():
+            for record in records:
+                yield orjson.dumps(record, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+        return StreamingResponse(iter_ndjson(), media_type="application/x-ndjson")
     except Exception as e:
         logger.error(f"Error in get_underperforming_bsks: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
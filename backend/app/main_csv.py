@@ -52,4 +52,16 @@ app = FastAPI(
     version="2.0.0"
 )
 
+@app.get("/overview")
+def get_overview():
+    """Row counts for the dashboard summary, in one round trip"""
+    data = load_csv_data()
+    if data is None:
+        raise HTTPException(status_code=503, detail="CSV data not loaded")
+    return {
+        "bsks": len(data['bsks'].index),
+        "deos": len(data['deos'].index),
+        "services": len(data['services'].index)
+    }
+
 # ... (rest of the code)
\ No newline at end of file
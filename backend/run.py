@@ -1,4 +1,5 @@
 import uvicorn
+import gc
 import os
 import sys
 from pathlib import Path
@@ -9,21 +10,49 @@ sys.path.insert(0, str(backend_dir))
 
 # Now import
 from app.main_csv import app
+from app.data_loader import load_csv_data
+
+def run_preforked(port, workers):
+    """Serve with gunicorn so workers fork from a parent that already holds the data"""
+    from gunicorn.app.base import BaseApplication
+
+    class PreloadedApp(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"0.0.0.0:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("preload_app", True)
+            self.cfg.set("loglevel", "warning")
+
+        def load(self):
+            return app
+
+    PreloadedApp().run()
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 10000))
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
     
     print("=" * 60)
     print("🚀 BSK Training Optimization API (CSV-Based)")
     print("=" * 60)
     print(f"📍 Host: 0.0.0.0")
     print(f"🔌 Port: {port}")
+    print(f"👷 Workers: {workers}")
     print(f"📊 Data: CSV files")
     print("=" * 60)
     
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=port,
-        log_level="info"
-    )
\ No newline at end of file
+    # Load the CSV/parquet data before any worker starts. Forked workers share
+    # these pages copy-on-write; freezing keeps the GC from touching them.
+    load_csv_data()
+    gc.freeze()
+    
+    if workers > 1:
+        run_preforked(port, workers)
+    else:
+        uvicorn.run(
+            app,
+            host="0.0.0.0",
+            port=port,
+            log_level="warning"
+        )
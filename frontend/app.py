@@ -1,6 +1,6 @@
 import streamlit as st
-import requests
 import os
+from utils import SESSION, fetch_json
 
 # Configure the page
 st.set_page_config(
@@ -21,16 +21,14 @@ API_BASE_URL = os.getenv("BACKEND_URL", "http://localhost:54300")
 
 def fetch_all_data(endpoint):
     try:
-        response = requests.get(f"{API_BASE_URL}/{endpoint}")
-        response.raise_for_status()
-        return response.json()
+        return fetch_json(endpoint)
     except Exception as e:
         st.error(f"Error fetching {endpoint}: {e}")
         return []
 
 # Check backend connection
 try:
-    response = requests.get(f"{API_BASE_URL}/", timeout=5)
+    response = SESSION.get(f"{API_BASE_URL}/", timeout=5)
     if response.status_code == 200:
         st.success(f"✅ Connected to backend at: {API_BASE_URL}")
     else:
@@ -39,13 +37,11 @@ except Exception as e:
     st.error(f"❌ Cannot connect to backend at {API_BASE_URL}: {e}")
     st.info("Please ensure the backend service is running.")
 
-bsk_centers = fetch_all_data("bsk/")
-deos = fetch_all_data("deo/")
-services = fetch_all_data("services/")
+overview = fetch_all_data("overview") or {}
 
-num_bsks = len(bsk_centers) if bsk_centers else 0
-num_deos = len(deos) if deos else 0
-num_services = len(services) if services else 0
+num_bsks = overview.get("bsks", 0)
+num_deos = overview.get("deos", 0)
+num_services = overview.get("services", 0)
 
 # Display summary info at the top
 st.markdown("### System Overview")
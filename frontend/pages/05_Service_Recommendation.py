@@ -8,6 +8,7 @@ from sklearn.cluster import KMeans
 import pydeck as pdk
 from pathlib import Path
 import warnings
+from utils import SESSION
 warnings.filterwarnings('ignore')
 
 # Add paths for backend and AI service imports
@@ -106,12 +107,21 @@ if 'current_page' not in st.session_state:
 if 'selected_bsk' not in st.session_state:
     st.session_state.selected_bsk = None
 
-def fetch_data(endpoint):
-    """Fetch data from API with improved error handling"""
+def fetch_data(endpoint, page_size=1000):
+    """Fetch every row of a list endpoint, paging with skip/limit (the API caps limit at 1000)"""
     try:
-        response = requests.get(f"{API_BASE_URL}/{endpoint}", timeout=5)
-        response.raise_for_status()
-        return response.json()
+        rows = []
+        while True:
+            response = SESSION.get(
+                f"{API_BASE_URL}/{endpoint}",
+                params={"skip": len(rows), "limit": page_size},
+                timeout=5
+            )
+            response.raise_for_status()
+            page = response.json()
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
     except requests.exceptions.ConnectionError:
         st.warning(f"🔌 Cannot connect to backend service at {API_BASE_URL}")
         return []
@@ -161,9 +161,11 @@ if st.session_state.filters:
         df = pd.DataFrame()
         try:
             import requests
-            resp = requests.get(f"{API_BASE_URL}/underperforming_bsks/", params=params)
+            import json
+            resp = requests.get(f"{API_BASE_URL}/underperforming_bsks/", params=params, stream=True)
             resp.raise_for_status()
-            data = resp.json()
+            # Backend streams one JSON record per line (NDJSON)
+            data = [json.loads(line) for line in resp.iter_lines() if line]
             df = pd.DataFrame(data)
         except Exception as e:
             st.error(f"Error fetching data: {e}")
@@ -1,20 +1,34 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import os
 
 # Get API URL from environment variable or use localhost as fallback
 API_BASE_URL = os.getenv("BACKEND_URL", "http://localhost:54300")
 
+# Shared keep-alive session so page reruns reuse pooled TCP/TLS connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers["Accept-Encoding"] = "gzip"
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_json(endpoint, params=None):
+    """GET an API endpoint, cached per (endpoint, params) for 60 seconds.
+    Errors are raised, not cached, so callers can report them and retry."""
+    response = SESSION.get(f"{API_BASE_URL}/{endpoint}", params=params)
+    response.raise_for_status()
+    return response.json()
+
 def fetch_data_with_controls(endpoint):
     st.sidebar.markdown(f"---\n**{endpoint.replace('/', '').capitalize()} Controls**")
-    limit = st.sidebar.number_input(f"Limit for {endpoint}", min_value=1, value=100, step=1, key=f"limit_{endpoint}")
+    limit = st.sidebar.number_input(f"Limit for {endpoint}", min_value=1, max_value=1000, value=100, step=1, key=f"limit_{endpoint}")
     skip = st.sidebar.number_input(f"Skip for {endpoint}", min_value=0, value=0, step=1, key=f"skip_{endpoint}")
     
     params = {"limit": limit, "skip": skip}
     try:
-        response = requests.get(f"{API_BASE_URL}/{endpoint}", params=params)
-        response.raise_for_status()
-        return response.json(), limit, skip
+        return fetch_json(endpoint, params), limit, skip
     except Exception as e:
         st.error(f"Error fetching {endpoint}: {e}")
         return [], limit, skip